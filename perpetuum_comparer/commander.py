@@ -1,14 +1,57 @@
 import configargparse
 import logging
-import pandas as pd
-from termcolor import colored
-from tabulate import tabulate
-from perpetuum_comparer.utils import read_df_from_path, logging_setup, export_df_to_path
-from perpetuum_comparer.comparer import DataComparer
-from perpetuum_comparer.duck_comparer import DuckDataComparer
+import os
+from perpetuum_comparer.engines import (
+    AUTO_ENGINE,
+    available_engines,
+    get_engine,
+    load_thresholds,
+    select_engine,
+)
 
 parser = configargparse.ArgParser()
 
+# options of the one-shot comparison that watch mode does not use
+WATCH_IGNORED_OPTIONS = {
+    "secondary_df": "-sd/--secondary_df",
+    "comparison_engine": "-ce/--comparison_engine",
+    "show_details": "-sh/--show_details",
+    "max_rows": "-mr/--max_rows",
+    "page": "-pg/--page",
+    "auto_thresholds": "-at/--auto_thresholds",
+    "threads": "-th/--threads",
+    "memory_limit": "-ml/--memory_limit",
+    "temp_dir": "-td/--temp_dir",
+}
+
+
+def positive_int(value: str) -> int:
+    """Parse a strictly positive integer argument."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise configargparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise configargparse.ArgumentTypeError(f"must be a positive integer: '{value}'")
+    return number
+
+
+def normalized_option(dest: str, value):
+    """Return an option value as main() interprets it, to tell a default from an explicit value."""
+    if dest == "show_details":
+        return value.upper() != "N"
+    return value
+
+
+def engine_name(name: str) -> str:
+    """Validate the engine name against the registry when the arguments are parsed."""
+    if name != AUTO_ENGINE and name not in available_engines():
+        raise configargparse.ArgumentTypeError(
+            f"invalid choice: '{name}' (choose from {', '.join(available_engines() + [AUTO_ENGINE])})"
+        )
+    return name
+
+
 parser.add(
     "-pd",
     "--primary_df",
@@ -19,8 +62,34 @@ parser.add(
 parser.add(
     "-sd",
     "--secondary_df",
-    required=True,
-    help="Path to secondary Dataset that will be compared.",
+    required=False,
+    default=None,
+    help="Path to secondary Dataset that will be compared, required unless --watch_dir is given.",
+)
+
+parser.add(
+    "-wd",
+    "--watch_dir",
+    required=False,
+    default=None,
+    help="Directory to watch for new secondary datasets, compared against the resident primary one.",
+)
+
+parser.add(
+    "-wp",
+    "--watch_pattern",
+    required=False,
+    default="*.csv",
+    help="File name pattern of the watched secondary datasets, defaults to *.csv.",
+)
+
+parser.add(
+    "-wi",
+    "--watch_interval",
+    required=False,
+    type=float,
+    default=1.0,
+    help="Seconds between two polls of the watched directory, defaults to 1.",
 )
 
 parser.add(
@@ -46,6 +115,24 @@ parser.add(
     help="Show comparison details tabular data",
 )
 
+parser.add(
+    "-mr",
+    "--max_rows",
+    required=False,
+    type=positive_int,
+    default=20,
+    help="Maximum number of rows rendered per details table, defaults to 20.",
+)
+
+parser.add(
+    "-pg",
+    "--page",
+    required=False,
+    type=positive_int,
+    default=1,
+    help="Page of the details tables to render, defaults to 1.",
+)
+
 parser.add(
     "-ep",
     "--export_path",
@@ -57,9 +144,43 @@ parser.add(
 parser.add(
     "-ce",
     "--comparison_engine",
-    required=True,
+    required=False,
+    default=None,
+    type=engine_name,
+    help="Comparison engine to use in process, auto picks one from the input sizes.",
+)
+
+parser.add(
+    "-at",
+    "--auto_thresholds",
+    required=False,
     default=None,
-    help="Comparison engine to use in process",
+    help="Path to a JSON file overriding the auto engine thresholds.",
+)
+
+parser.add(
+    "-th",
+    "--threads",
+    required=False,
+    type=positive_int,
+    default=None,
+    help="Maximum number of threads used by the sql engine.",
+)
+
+parser.add(
+    "-ml",
+    "--memory_limit",
+    required=False,
+    default=None,
+    help="Memory limit of the sql engine (e.g. 4GB), larger operations spill to disk.",
+)
+
+parser.add(
+    "-td",
+    "--temp_dir",
+    required=False,
+    default=None,
+    help="Directory the sql engine spills to when exceeding its memory limit.",
 )
 
 parser.add(
@@ -73,6 +194,38 @@ parser.add(
 
 def main():
     args = parser.parse_args()
+    if not args.secondary_df and not args.watch_dir:
+        parser.error("one of the arguments -sd/--secondary_df -wd/--watch_dir is required")
+    if not args.comparison_engine and not args.watch_dir:
+        parser.error("the following arguments are required: -ce/--comparison_engine")
+    if args.auto_thresholds and args.comparison_engine != AUTO_ENGINE and not args.watch_dir:
+        parser.error(f"-at/--auto_thresholds is only allowed with -ce {AUTO_ENGINE}")
+    if args.watch_dir:
+        ignored_options = [
+            flag
+            for dest, flag in WATCH_IGNORED_OPTIONS.items()
+            if normalized_option(dest, getattr(args, dest))
+            != normalized_option(dest, parser.get_default(dest))
+        ]
+        if ignored_options:
+            parser.error(
+                f"not allowed with -wd/--watch_dir: {', '.join(ignored_options)}"
+            )
+        if not os.path.isdir(args.watch_dir):
+            parser.error(f"watch directory {args.watch_dir} does not exist")
+    # heavy dependencies are only imported once the arguments are valid
+    from termcolor import colored
+    from perpetuum_comparer.renderer import (
+        render_details,
+        render_difference_summary,
+        summarize_differences,
+    )
+    from perpetuum_comparer.utils import (
+        read_df_from_path,
+        logging_setup,
+        export_df_to_path,
+    )
+
     primary_df_path = args.primary_df
     secondary_df_path = args.secondary_df
     test_name = args.test_name
@@ -80,6 +233,8 @@ def main():
     log_level = args.log_level
     export_path = args.export_path
     comparison_engine = args.comparison_engine
+    max_rows = args.max_rows
+    page = args.page
     if args.show_details.upper() == "N":
         show_details = False
     else:
@@ -90,112 +245,84 @@ def main():
         ll = logging.ERROR
     log = logging_setup(ll)
 
+    if args.watch_dir:
+        from perpetuum_comparer.watcher import BaselineWatcher, check_export_path
+
+        try:
+            check_export_path(args.watch_dir, export_path)
+        except ValueError as error:
+            parser.error(str(error))
+        df_p = read_df_from_path(primary_df_path, log=log, input_format="csv")
+        if df_p.empty:
+            log.error("Primary DataFrame is empty. Stopping watch mode!")
+            exit(1)
+        try:
+            watcher = BaselineWatcher(test_name=test_name, primary_df=df_p, line_id=line_id)
+        except ValueError as error:
+            parser.error(str(error))
+        watcher.watch(
+            args.watch_dir,
+            pattern=args.watch_pattern,
+            interval=args.watch_interval,
+            export_path=export_path,
+        )
+        return None
+
+    if comparison_engine == AUTO_ENGINE:
+        thresholds = None
+        if args.auto_thresholds:
+            try:
+                thresholds = load_thresholds(args.auto_thresholds)
+            except (OSError, ValueError) as error:
+                parser.error(f"invalid -at/--auto_thresholds file {args.auto_thresholds}: {error}")
+        comparison_engine = select_engine(
+            primary_df_path, secondary_df_path, log=log, thresholds=thresholds
+        )
+
     # import dataframes
     df_p = read_df_from_path(primary_df_path, log=log, input_format="csv")
     df_s = read_df_from_path(secondary_df_path, log=log, input_format="csv")
 
     # initialize data comparer
-    if comparison_engine == 'sql':
-        dc = DuckDataComparer(
-            test_name=test_name, primary_df=df_p, secondary_df=df_s, line_id=line_id
-        )
-    else:
-        dc = DataComparer(
-            test_name=test_name, primary_df=df_p, secondary_df=df_s, line_id=line_id
-        )
-
-    # run comparison logic
-    structural_match = dc.structural_comparison()
-    if structural_match:
+    engine_options = {}
+    if comparison_engine == "sql":
+        engine_options = {
+            "threads": args.threads,
+            "memory_limit": args.memory_limit,
+            "temp_dir": args.temp_dir,
+        }
+    elif args.threads is not None or args.memory_limit or args.temp_dir:
         print(
-            f"The compared datasets are identical from a structural perspective ! - {colored('OK','green')} ✅"
+            f"-th/--threads, -ml/--memory_limit and -td/--temp_dir only apply to the sql engine, "
+            f"they have no effect with the {comparison_engine} engine. ❌ "
         )
-
-        diffs = dc.content_comparison()
-
-        if len(diffs) == 0 and len(dc.exclusive_primary_indexes) == 0:
-            print(
-                f"No content differences between the compared datasets ! - {colored('OK','green')} ✅"
-            )
-        else:
-            print("There are differences in the content of the 2 dataframes. ❌ ")
-            (common_diffs, primary_exclusive, secondary_exclusive, export_diffs) = (
-                dc.generate_reports(diffs)
-            )
-
-            difference_count = (
-                common_diffs.shape[0]
-                + primary_exclusive.shape[0]
-                + secondary_exclusive.shape[0]
-            )
-            percentage_of_difference = (
-                round(difference_count / dc.primary_df.shape[0], 4) * 100
-            )
-
-            print(
-                f"There is a {colored(round(percentage_of_difference,2), 'red')} % difference between the 2 files."
-            )
-
-            if not show_details:
-                if export_path:
-                    export_df_to_path(
-                        export_diffs, log, export_path=export_path, file_name=test_name
-                    )
-                return None
-
-            print(
-                tabulate(
-                    common_diffs,
-                    headers=common_diffs.columns,
-                    tablefmt="grid",
-                    showindex="always",
-                )
-            )
-            if primary_exclusive.shape[0] > 0 :
-                print("Records that are only present in the Primary dataset : ")
-                print(
-                    tabulate(
-                        primary_exclusive,
-                        headers=primary_exclusive.columns,
-                        tablefmt="grid",
-                        showindex="always",
-                    )
-                )
-            else:
-                print(f"No records that are only present in the Primary dataset. - {colored('OK','green')} ✅")
-
-            if secondary_exclusive.shape[0] > 0:
-                print("Records that are only present in the Secondary dataset : ")
-                print(
-                    tabulate(
-                        secondary_exclusive,
-                        headers=secondary_exclusive.columns,
-                        tablefmt="grid",
-                        showindex="always",
-                    )
-                )
-            else:
-                print(f"No records that are only present in the Secondary dataset. - {colored('OK','green')} ✅")
-
-            if export_path:
-                export_df_to_path(
-                    export_diffs, log, export_path=export_path, file_name=test_name
-                )
-    else:
-        if len(dc.structural_matches) == 0:
-            print(
-                "There are no structural matches between the compared datasets. They are completely different. ❌ "
-            )
-        else:
+    comparer_class = get_engine(comparison_engine)
+    try:
+        dc = comparer_class(
+            test_name=test_name,
+            primary_df=df_p,
+            secondary_df=df_s,
+            line_id=line_id,
+            **engine_options,
+        )
+    except ValueError as error:
+        log.error(f"{error}. Stopping comparison!")
+        exit(1)
+
+    try:
+        # run comparison logic
+        structural_match = dc.structural_comparison()
+        if structural_match:
             print(
-                "There are structural differences between the compared datasets, but also common fields. ❌ "
+                f"The compared datasets are identical from a structural perspective ! - {colored('OK','green')} ✅"
             )
-            dc.display_structural_comparison()
 
             diffs = dc.content_comparison()
 
             if len(diffs) == 0 and len(dc.exclusive_primary_indexes) == 0:
-                print("No content differences between the compared datasets. - {colored('OK','green')} ✅")
+                print(
+                    f"No content differences between the compared datasets ! - {colored('OK','green')} ✅"
+                )
             else:
                 print("There are differences in the content of the 2 dataframes. ❌ ")
                 (common_diffs, primary_exclusive, secondary_exclusive, export_diffs) = (
@@ -212,52 +339,96 @@ def main():
                 )
 
                 print(
-                f"There is a {colored(round(percentage_of_difference,2), 'red')} % difference between the 2 files."
+                    f"There is a {colored(round(percentage_of_difference,2), 'red')} % difference between the 2 files."
+                )
+                render_difference_summary(
+                    summarize_differences(
+                        dc.primary_df,
+                        dc.secondary_df,
+                        line_id,
+                        [column for column, _ in dc.structural_matches],
+                    )
                 )
 
                 if not show_details:
+                    if export_path:
+                        export_df_to_path(
+                            export_diffs, log, export_path=export_path, file_name=test_name
+                        )
                     return None
 
-                print(
-                    tabulate(
-                        common_diffs,
-                        headers=common_diffs.columns,
-                        tablefmt="grid",
-                        showindex="always",
-                    )
+                render_details(
+                    common_diffs,
+                    primary_exclusive,
+                    secondary_exclusive,
+                    page_size=max_rows,
+                    page=page,
                 )
 
-                if primary_exclusive.shape[0] > 0 :
-                    print("Records that are only present in the Primary dataset : ")
-                    print(
-                        tabulate(
-                            primary_exclusive,
-                            headers=primary_exclusive.columns,
-                            tablefmt="grid",
-                            showindex="always",
-                        )
+                if export_path:
+                    export_df_to_path(
+                        export_diffs, log, export_path=export_path, file_name=test_name
                     )
+        else:
+            if len(dc.structural_matches) == 0:
+                print(
+                    "There are no structural matches between the compared datasets. They are completely different. ❌ "
+                )
+            else:
+                print(
+                    "There are structural differences between the compared datasets, but also common fields. ❌ "
+                )
+                dc.display_structural_comparison()
+
+                diffs = dc.content_comparison()
+
+                if len(diffs) == 0 and len(dc.exclusive_primary_indexes) == 0:
+                    print("No content differences between the compared datasets. - {colored('OK','green')} ✅")
                 else:
-                    print(f"No records that are only present in the Primary dataset. - {colored('OK','green')} ✅")
-                
-                if secondary_exclusive.shape[0] > 0:
-                    print("Records that are only present in the Secondary dataset : ")
+                    print("There are differences in the content of the 2 dataframes. ❌ ")
+                    (common_diffs, primary_exclusive, secondary_exclusive, export_diffs) = (
+                        dc.generate_reports(diffs)
+                    )
+
+                    difference_count = (
+                        common_diffs.shape[0]
+                        + primary_exclusive.shape[0]
+                        + secondary_exclusive.shape[0]
+                    )
+                    percentage_of_difference = (
+                        round(difference_count / dc.primary_df.shape[0], 4) * 100
+                    )
+
                     print(
-                        tabulate(
-                            secondary_exclusive,
-                            headers=secondary_exclusive.columns,
-                            tablefmt="grid",
-                            showindex="always",
+                    f"There is a {colored(round(percentage_of_difference,2), 'red')} % difference between the 2 files."
+                    )
+                    render_difference_summary(
+                        summarize_differences(
+                            dc.primary_df,
+                            dc.secondary_df,
+                            line_id,
+                            [column for column, _ in dc.structural_matches],
                         )
                     )
-                else:
-                    print(f"No records that are only present in the Secondary dataset. - {colored('OK','green')} ✅")
 
-                if export_path:
-                    export_df_to_path(
-                        export_diffs, log, export_path=export_path, file_name=test_name
+                    if not show_details:
+                        return None
+
+                    render_details(
+                        common_diffs,
+                        primary_exclusive,
+                        secondary_exclusive,
+                        page_size=max_rows,
+                        page=page,
                     )
 
+                    if export_path:
+                        export_df_to_path(
+                            export_diffs, log, export_path=export_path, file_name=test_name
+                        )
+    finally:
+        dc.close()
+
 
 if __name__ == "__main__":
     main()
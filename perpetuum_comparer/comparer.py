@@ -2,9 +2,7 @@
 
 import logging
 import pandas as pd
-import numpy as np
 from tqdm import tqdm
-from datetime import datetime
 from tabulate import tabulate
 from termcolor import colored
 from perpetuum_comparer.utils import logging_setup
@@ -40,6 +38,10 @@ class DataComparer:
         self.exclusive_primary_indexes = []
         self.exclusive_secondary_indexes = []
 
+    def close(self) -> None:
+        """Release engine resources, the pandas engine holds none."""
+        return None
+
     def structural_comparison(self) -> bool:
         """Initialize Data Comparer.
 
@@ -2,16 +2,18 @@
 
 import logging
 import pandas as pd
-import numpy as np
 from tqdm import tqdm
-from datetime import datetime
 from tabulate import tabulate
 from termcolor import colored
 import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
 from perpetuum_comparer.utils import logging_setup
 
 log = logging_setup(logging.ERROR)
 
+ARROW_BATCH_SIZE = 100000
+
 class DuckDataComparer:
     """Main comparison class."""
 
@@ -21,6 +23,9 @@ class DuckDataComparer:
         primary_df: pd.DataFrame,
         secondary_df: pd.DataFrame,
         line_id: str,
+        threads: "int | None" = None,
+        memory_limit: "str | None" = None,
+        temp_dir: "str | None" = None,
     ) -> None:
         """Initialize Data Comparer.
 
@@ -29,6 +34,9 @@ class DuckDataComparer:
         primary_df(pd.DataFrame): Primary dataframe for comparison.
         secondary_df(pd.DataFrame): Secondary dataframe for comparison.
         line_id(str): Line identifier for dataframes.
+        threads(int): Maximum DuckDB worker threads, defaults to DuckDB's own setting.
+        memory_limit(str): DuckDB memory limit (e.g. 4GB), above it operators spill to disk.
+        temp_dir(str): Directory used by DuckDB to spill intermediate results.
 
         Returns:
         None
@@ -39,6 +47,59 @@ class DuckDataComparer:
         self.line_id = line_id
         self.exclusive_primary_indexes = []
         self.exclusive_secondary_indexes = []
+        self.connection = self.connect(
+            threads=threads, memory_limit=memory_limit, temp_dir=temp_dir
+        )
+
+    @staticmethod
+    def connect(
+        threads: "int | None" = None,
+        memory_limit: "str | None" = None,
+        temp_dir: "str | None" = None,
+    ) -> duckdb.DuckDBPyConnection:
+        """Open a dedicated in-memory DuckDB connection with the given resource limits."""
+        config = {}
+        if threads is not None:
+            config["threads"] = threads
+        if memory_limit:
+            config["memory_limit"] = memory_limit
+        if temp_dir:
+            config["temp_directory"] = temp_dir
+        log.info(f"Opening DuckDB connection with config : {config}")
+        try:
+            return duckdb.connect(database=":memory:", config=config)
+        except duckdb.Error as error:
+            raise ValueError(f"Invalid DuckDB configuration {config} : {error}") from error
+
+    def fetch_line_ids(self, query: str) -> pa.ChunkedArray:
+        """Stream the first column of the query result as Arrow record batches."""
+        result = self.connection.execute(query)
+        if hasattr(result, "to_arrow_reader"):
+            reader = result.to_arrow_reader(ARROW_BATCH_SIZE)
+        else:
+            reader = result.fetch_record_batch(ARROW_BATCH_SIZE)
+        return pa.chunked_array(
+            [batch.column(0) for batch in reader], type=reader.schema.field(0).type
+        )
+
+    def filter_by_line_ids(
+        self, data: pd.DataFrame, line_ids: pa.ChunkedArray
+    ) -> pd.DataFrame:
+        """Keep the rows whose line id is in the Arrow line ids, matched in Arrow without a numpy copy of the ids."""
+        line_id_column = pa.array(data[self.line_id], from_pandas=True)
+        value_set = line_ids.combine_chunks().cast(line_id_column.type)
+        mask = pc.is_in(line_id_column, value_set=value_set)
+        return data[mask.to_numpy(zero_copy_only=False)]
+
+    def close(self) -> None:
+        """Close the DuckDB connection."""
+        self.connection.close()
+
+    def __enter__(self) -> "DuckDataComparer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def structural_comparison(self) -> bool:
         """Initialize Data Comparer.
@@ -121,17 +182,27 @@ class DuckDataComparer:
             subset_primary_df = pd.DataFrame()
             subset_secondary_df = pd.DataFrame()
         
-        # comparison between primary and secondary (in DuckDb)
-        diffs_ps = duckdb.sql("""
-            SELECT * FROM subset_primary_df EXCEPT SELECT * FROM subset_secondary_df
-        """).df()
-        diffs_sp = duckdb.sql("""
-            SELECT * FROM subset_secondary_df EXCEPT SELECT * FROM subset_primary_df
-        """).df()
+        # comparison between primary and secondary (in DuckDb), only the line ids
+        # of the differing records are handed back to Python
+        self.connection.register("subset_primary_df", subset_primary_df)
+        self.connection.register("subset_secondary_df", subset_secondary_df)
+        line_id_col = '"' + self.line_id.replace('"', '""') + '"'
+        diff_ids_ps = self.fetch_line_ids(f"""
+            SELECT DISTINCT {line_id_col} FROM (
+                SELECT * FROM subset_primary_df EXCEPT SELECT * FROM subset_secondary_df
+            )
+        """)
+        diff_ids_sp = self.fetch_line_ids(f"""
+            SELECT DISTINCT {line_id_col} FROM (
+                SELECT * FROM subset_secondary_df EXCEPT SELECT * FROM subset_primary_df
+            )
+        """)
+        self.connection.unregister("subset_primary_df")
+        self.connection.unregister("subset_secondary_df")
         differences = []
 
-        subset_primary_df_adj = subset_primary_df[subset_primary_df[self.line_id].isin(diffs_ps[self.line_id].unique())]
-        subset_secondary_df_adj = subset_secondary_df[subset_secondary_df[self.line_id].isin(diffs_sp[self.line_id].unique())]
+        subset_primary_df_adj = self.filter_by_line_ids(subset_primary_df, diff_ids_ps)
+        subset_secondary_df_adj = self.filter_by_line_ids(subset_secondary_df, diff_ids_sp)
 
         for index, rec in tqdm(subset_primary_df_adj.head(1000).iterrows(),total=subset_primary_df_adj.shape[0]):
             index_dict = {"index": index, "key_differences": [], "secondary_val": []}
@@ -0,0 +1,141 @@
+"""Registry of comparison engines, imported only when selected."""
+
+import importlib
+import json
+import logging
+import os
+
+ENGINES = {
+    "pandas": "perpetuum_comparer.comparer:DataComparer",
+    "sql": "perpetuum_comparer.duck_comparer:DuckDataComparer",
+}
+
+
+def register_engine(name: str, target: str) -> None:
+    """Register a comparison engine given as a "module:ClassName" import path.
+
+    The class takes the DataComparer constructor arguments and provides its
+    structural_comparison, content_comparison, generate_reports and close methods.
+    """
+    if ":" not in target:
+        raise ValueError(f"Invalid engine target {target}, expected module:ClassName.")
+    ENGINES[name] = target
+
+
+def available_engines() -> "list[str]":
+    """Return the names of all registered comparison engines."""
+    return list(ENGINES.keys())
+
+
+def get_engine(name: str) -> type:
+    """Given an engine name, import its module and return the comparer class."""
+    if name not in ENGINES:
+        raise KeyError(
+            f"Unknown comparison engine {name}, available engines : {', '.join(available_engines())}."
+        )
+    module_name, class_name = ENGINES[name].split(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+AUTO_ENGINE = "auto"
+
+# Cost model thresholds for the auto engine. Calibrate them from benchmark runs
+# and override through a JSON file given with --auto_thresholds.
+AUTO_THRESHOLDS = {
+    # bytes sampled from the head of each file to estimate the row count
+    "sample_bytes": 65536,
+    # in-memory DataFrame footprint relative to the CSV size on disk
+    "memory_expansion_factor": 5.0,
+    # share of the available memory the loaded datasets may use before warning
+    "memory_budget_ratio": 0.5,
+    # largest input (rows x columns) handled by the row-wise pandas engine
+    "pandas_max_cells": 50000,
+    # below this CPU count DuckDB parallelism gains little, allow larger pandas inputs
+    "sql_min_cpus": 2,
+    "single_cpu_pandas_max_cells": 200000,
+}
+
+
+def load_thresholds(thresholds_path: str) -> dict:
+    """Given a JSON file path, return the auto thresholds updated with its values."""
+    with open(thresholds_path) as thresholds_file:
+        overrides = json.load(thresholds_file)
+    unknown_keys = set(overrides) - set(AUTO_THRESHOLDS)
+    if unknown_keys:
+        raise ValueError(
+            f"Unknown auto thresholds : {', '.join(sorted(unknown_keys))}."
+        )
+    return {**AUTO_THRESHOLDS, **overrides}
+
+
+def available_memory() -> "int | None":
+    """Return the available physical memory in bytes, None if it cannot be read."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def profile_input(input_path: str, sample_bytes: int) -> dict:
+    """Given a CSV file path, estimate its size, row count and column count from a sample."""
+    profile = {"size": 0, "rows": 0, "columns": 0}
+    if not os.path.isfile(input_path):
+        return profile
+    profile["size"] = os.path.getsize(input_path)
+    with open(input_path, "rb") as input_file:
+        sample = input_file.read(sample_bytes)
+    lines = sample.splitlines()
+    if not lines:
+        return profile
+    profile["columns"] = len(lines[0].split(b","))
+    if len(sample) >= profile["size"]:
+        profile["rows"] = len(lines) - 1
+    else:
+        # drop the last, possibly truncated, line from the average
+        sampled_lines = max(len(lines) - 1, 1)
+        sampled_size = len(sample) - len(lines[-1])
+        profile["rows"] = int(profile["size"] / max(sampled_size / sampled_lines, 1)) - 1
+    return profile
+
+
+def select_engine(
+    primary_path: str,
+    secondary_path: str,
+    log: logging.Logger,
+    thresholds: "dict | None" = None,
+) -> str:
+    """Given the compared file paths, pick the cheapest comparison engine and log why."""
+    thresholds = thresholds or AUTO_THRESHOLDS
+    profiles = [
+        profile_input(path, thresholds["sample_bytes"])
+        for path in (primary_path, secondary_path)
+    ]
+    total_size = sum(profile["size"] for profile in profiles)
+    cells = max(profile["rows"] * profile["columns"] for profile in profiles)
+    memory = available_memory()
+    cpus = os.cpu_count() or 1
+    log.info(
+        f"Auto engine inputs : {total_size:,} bytes, {cells:,} cells (rows x columns), "
+        f"{'unknown' if memory is None else f'{memory:,} bytes'} available memory, {cpus} CPUs."
+    )
+
+    estimated_memory = total_size * thresholds["memory_expansion_factor"]
+    if memory is not None and estimated_memory > memory * thresholds["memory_budget_ratio"]:
+        # both engines load the full files in pandas, neither of them avoids this,
+        # printed so it shows with the default error log level
+        print(
+            f"Estimated in-memory footprint of {int(estimated_memory):,} bytes exceeds the memory budget "
+            f"of {int(memory * thresholds['memory_budget_ratio']):,} bytes, the comparison may run out of memory. ❌ "
+        )
+    if cells <= thresholds["pandas_max_cells"]:
+        engine = "pandas"
+        reason = f"{cells:,} cells fit the in-memory pandas engine"
+    elif cpus < thresholds["sql_min_cpus"] and cells <= thresholds["single_cpu_pandas_max_cells"]:
+        engine = "pandas"
+        reason = f"{cells:,} cells on {cpus} CPU do not benefit from DuckDB parallelism"
+    else:
+        engine = "sql"
+        reason = f"{cells:,} cells exceed the pandas engine threshold, using DuckDB on {cpus} CPUs"
+    log.info(f"Auto engine selected {engine} : {reason}.")
+    return engine
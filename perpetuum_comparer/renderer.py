@@ -0,0 +1,119 @@
+"""Bounded terminal rendering for comparison reports."""
+
+import sys
+import pandas as pd
+from termcolor import colored
+from tabulate import tabulate
+
+
+def page_bounds(total_rows: int, page_size: int, page: int) -> "tuple[int, int]":
+    """Given table size, page size and 1-based page number, return the [start, stop) row slice."""
+    if page_size < 1:
+        raise ValueError("Page size must be a positive integer.")
+    if page < 1:
+        raise ValueError("Page number must be a positive integer.")
+    start = min((page - 1) * page_size, total_rows)
+    stop = min(start + page_size, total_rows)
+    return start, stop
+
+
+def render_table(
+    data: pd.DataFrame, page_size: int = 20, page: int = 1, stream=None
+) -> None:
+    """Format only the requested page of the given table and write it to the stream."""
+    stream = stream or sys.stdout
+    total_rows = data.shape[0]
+    if total_rows == 0:
+        stream.write("No differing records.\n")
+        stream.flush()
+        return None
+    start, stop = page_bounds(total_rows, page_size, page)
+    total_pages = (total_rows + page_size - 1) // page_size
+    if page > total_pages:
+        stream.write(
+            f"Page {page:,} is out of range, {total_rows:,} rows available ({total_pages:,} pages).\n"
+        )
+        stream.flush()
+        return None
+    page_data = data.iloc[start:stop]
+    stream.write(
+        tabulate(
+            page_data,
+            headers=page_data.columns,
+            tablefmt="grid",
+            showindex="always",
+        )
+    )
+    stream.write("\n")
+    stream.write(
+        f"Showing rows {start + 1:,}-{stop:,} of {total_rows:,} (page {page:,}/{total_pages:,}).\n"
+    )
+    stream.flush()
+
+
+def summarize_differences(
+    primary_df: pd.DataFrame,
+    secondary_df: pd.DataFrame,
+    line_id: str,
+    columns: "list[str]",
+) -> dict:
+    """Given both datasets aligned on the line identifier, count mismatching rows per compared column."""
+    compared_columns = [column for column in columns if column != line_id]
+    if line_id not in columns or not compared_columns:
+        return {}
+    # same null handling as the comparison engines, first record wins on duplicated ids
+    primary = primary_df[columns].fillna("").drop_duplicates(subset=line_id).set_index(line_id)
+    secondary = secondary_df[columns].fillna("").drop_duplicates(subset=line_id).set_index(line_id)
+    common_ids = primary.index.intersection(secondary.index)
+    mismatches = (
+        primary.loc[common_ids, compared_columns]
+        != secondary.loc[common_ids, compared_columns]
+    ).sum()
+    return {
+        column: int(count)
+        for column, count in mismatches.sort_values(ascending=False, kind="stable").items()
+        if count > 0
+    }
+
+
+def render_difference_summary(summary: dict, stream=None) -> None:
+    """Write the per column mismatch counts to the stream."""
+    stream = stream or sys.stdout
+    if not summary:
+        return None
+    stream.write("Differences per column :\n")
+    for column, count in summary.items():
+        stream.write(f"column {column}: {count:,} mismatches\n")
+    stream.flush()
+
+
+def render_details(
+    common_diffs: pd.DataFrame,
+    primary_exclusive: pd.DataFrame,
+    secondary_exclusive: pd.DataFrame,
+    page_size: int = 20,
+    page: int = 1,
+    stream=None,
+) -> None:
+    """Render one page of every comparison report table."""
+    stream = stream or sys.stdout
+    render_table(common_diffs, page_size=page_size, page=page, stream=stream)
+
+    if primary_exclusive.shape[0] > 0:
+        stream.write("Records that are only present in the Primary dataset : \n")
+        render_table(primary_exclusive, page_size=page_size, page=page, stream=stream)
+    else:
+        stream.write(
+            f"No records that are only present in the Primary dataset. - {colored('OK','green')} ✅\n"
+        )
+
+    if secondary_exclusive.shape[0] > 0:
+        stream.write("Records that are only present in the Secondary dataset : \n")
+        render_table(
+            secondary_exclusive, page_size=page_size, page=page, stream=stream
+        )
+    else:
+        stream.write(
+            f"No records that are only present in the Secondary dataset. - {colored('OK','green')} ✅\n"
+        )
+    stream.flush()
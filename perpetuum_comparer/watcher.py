@@ -0,0 +1,326 @@
+"""Watch mode, comparing new snapshots against a resident baseline dataset."""
+
+import fnmatch
+import logging
+import os
+import time
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from termcolor import colored
+from perpetuum_comparer.renderer import render_difference_summary
+from perpetuum_comparer.utils import (
+    export_df_to_path,
+    logging_setup,
+    read_df_from_path,
+)
+
+log = logging_setup(logging.ERROR)
+
+
+def check_export_path(watch_dir: str, export_path: "str | None") -> None:
+    """Given the watched directory and export path, check the exports can be written and will not be watched."""
+    if not export_path:
+        return None
+    if not os.path.isdir(export_path):
+        raise ValueError(f"Export path {export_path} does not exist.")
+    real_watch_dir = os.path.realpath(watch_dir)
+    real_export_path = os.path.realpath(export_path)
+    if os.path.commonpath([real_watch_dir, real_export_path]) == real_watch_dir:
+        raise ValueError(
+            f"Export path {export_path} is inside the watched directory {watch_dir}, exports would be compared as snapshots."
+        )
+
+
+class BaselineWatcher:
+    """Keeps the primary dataset in memory and compares each new snapshot against it."""
+
+    def __init__(
+        self,
+        test_name: str,
+        primary_df: pd.DataFrame,
+        line_id: str,
+    ) -> None:
+        """Initialize Baseline Watcher.
+
+        Args:
+        test_name(str): Test Name used to generate the final reports.
+        primary_df(pd.DataFrame): Baseline dataframe every snapshot is compared to.
+        line_id(str): Line identifier for dataframes.
+
+        Returns:
+        None
+        """
+        if line_id not in primary_df.columns:
+            raise ValueError(f"Line identifier {line_id} missing from the primary dataset.")
+        self.test_name = test_name
+        self.primary_df = primary_df.reset_index(drop=True)
+        self.line_id = line_id
+        self.line_index = pd.Index(self.primary_df[line_id])
+        if not self.line_index.is_unique:
+            raise ValueError(f"Line identifier {line_id} is not unique in the primary dataset.")
+        self.fingerprints = {}
+        self.cast_columns = {}
+        self.line_indexes = {}
+        self.row_fingerprints(tuple((column, None) for column in self.primary_df.columns))
+        self.seen_files = {}
+        self.pending_files = {}
+
+    def baseline_column(self, column: str, dtype: "str | None") -> pd.Series:
+        """Return a baseline column, cast once to the given data type when it drifted in a snapshot."""
+        if dtype is None:
+            return self.primary_df[column]
+        if (column, dtype) not in self.cast_columns:
+            log.info(f"Casting baseline column {column} to {dtype}.")
+            self.cast_columns[(column, dtype)] = self.primary_df[column].astype(dtype)
+        return self.cast_columns[(column, dtype)]
+
+    def baseline_line_index(self, dtype: "str | None") -> pd.Index:
+        """Return the baseline line_id index, built once per data type."""
+        if dtype is None:
+            return self.line_index
+        if dtype not in self.line_indexes:
+            self.line_indexes[dtype] = pd.Index(self.baseline_column(self.line_id, dtype))
+        return self.line_indexes[dtype]
+
+    def row_fingerprints(self, layout: "tuple[tuple[str, str | None], ...]") -> np.ndarray:
+        """Return the baseline row hashes for the given (column, cast data type) layout, computed once per layout."""
+        if layout not in self.fingerprints:
+            log.info(f"Fingerprinting baseline over {len(layout)} columns.")
+            self.fingerprints[layout] = pd.util.hash_pandas_object(
+                pd.DataFrame(
+                    {column: self.baseline_column(column, dtype) for column, dtype in layout}
+                ),
+                index=False,
+            ).to_numpy()
+        return self.fingerprints[layout]
+
+    @staticmethod
+    def common_dtype(primary_dtype, secondary_dtype) -> str:
+        """Return the data type both sides of a drifted column are compared as."""
+        if is_numeric_dtype(primary_dtype) and is_numeric_dtype(secondary_dtype):
+            return "float64"
+        return "string"
+
+    def structural_differences(self, secondary_df: pd.DataFrame) -> "list[str]":
+        """Describe the columns missing on one side or whose data type drifted in the snapshot."""
+        differences = []
+        for column in self.primary_df.columns:
+            if column not in secondary_df.columns:
+                differences.append(f"column {column}: only in the Primary dataset, not compared")
+            elif self.primary_df[column].dtype != secondary_df[column].dtype:
+                differences.append(
+                    f"column {column}: {self.primary_df[column].dtype} in the Primary dataset, "
+                    f"{secondary_df[column].dtype} in the Secondary dataset, compared as "
+                    f"{self.common_dtype(self.primary_df[column].dtype, secondary_df[column].dtype)}"
+                )
+        for column in secondary_df.columns:
+            if column not in self.primary_df.columns:
+                differences.append(f"column {column}: only in the Secondary dataset, not compared")
+        return differences
+
+    def compare_snapshot(self, secondary_df: pd.DataFrame) -> "dict | None":
+        """Compare a snapshot against the baseline.
+
+        Columns whose data type drifted are cast to a common type on both sides and compared.
+
+        Args:
+        secondary_df(pd.DataFrame): Snapshot dataframe.
+
+        Returns:
+        report(dict): Differing records export, per column mismatch counts, exclusive record counts, structural differences.
+        """
+        if self.line_id not in secondary_df.columns:
+            log.error(
+                f"Line identifier {self.line_id} missing from the snapshot. Skipping snapshot!"
+            )
+            return None
+        secondary_df = secondary_df.reset_index(drop=True)
+        layout = tuple(
+            (
+                column,
+                None
+                if self.primary_df[column].dtype == secondary_df[column].dtype
+                else self.common_dtype(self.primary_df[column].dtype, secondary_df[column].dtype),
+            )
+            for column in self.primary_df.columns
+            if column in secondary_df.columns
+        )
+        columns = [column for column, _ in layout]
+        snapshot = pd.DataFrame(
+            {
+                column: secondary_df[column] if dtype is None else secondary_df[column].astype(dtype)
+                for column, dtype in layout
+            }
+        )
+        baseline_fingerprints = self.row_fingerprints(layout)
+        snapshot_fingerprints = pd.util.hash_pandas_object(snapshot, index=False).to_numpy()
+
+        line_id_dtype = dict(layout)[self.line_id]
+        positions = self.baseline_line_index(line_id_dtype).get_indexer(snapshot[self.line_id])
+        matched = positions >= 0
+        changed = matched & (
+            baseline_fingerprints[np.where(matched, positions, 0)]
+            != snapshot_fingerprints
+        )
+
+        changed_positions = positions[changed]
+        primary_rows = pd.DataFrame(
+            {
+                column: self.baseline_column(column, dtype)
+                .iloc[changed_positions]
+                .reset_index(drop=True)
+                for column, dtype in layout
+            }
+        )
+        secondary_rows = snapshot.loc[changed].reset_index(drop=True)
+        mismatches = ~(
+            (primary_rows == secondary_rows).fillna(False)
+            | (primary_rows.isna() & secondary_rows.isna())
+        )
+        export_diffs = self.primary_df.iloc[changed_positions].reset_index(drop=True).astype(object)
+        secondary_values = secondary_df.loc[changed, columns].reset_index(drop=True)
+        for column in columns:
+            column_mismatches = mismatches[column].to_numpy()
+            if column_mismatches.any():
+                export_diffs.loc[column_mismatches, column] = (
+                    export_diffs.loc[column_mismatches, column].map(str)
+                    + "/"
+                    + secondary_values.loc[column_mismatches, column].map(str)
+                )
+
+        column_counts = mismatches.sum()
+        summary = {
+            column: int(count)
+            for column, count in column_counts.sort_values(ascending=False).items()
+            if count > 0
+        }
+        return {
+            "export_diffs": export_diffs,
+            "summary": summary,
+            "primary_exclusive": self.primary_df.shape[0]
+            - np.unique(positions[matched]).shape[0],
+            "secondary_exclusive": int((~matched).sum()),
+            "structural_diffs": self.structural_differences(secondary_df),
+        }
+
+    @staticmethod
+    def scan(watch_dir: str, pattern: str = "*.csv") -> dict:
+        """Return the (size, modification time) signature of each file matching the pattern."""
+        signatures = {}
+        for entry in os.scandir(watch_dir):
+            if not fnmatch.fnmatch(entry.name, pattern):
+                continue
+            # a drop can be removed or renamed between the listing and the stat call
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            signatures[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return signatures
+
+    def poll(self, watch_dir: str, pattern: str = "*.csv") -> "list[str]":
+        """Return the new snapshot files whose size did not change since the previous poll."""
+        signatures = self.scan(watch_dir, pattern)
+        # forget vanished files so the tracking does not grow over a long watch
+        for tracked_files in (self.seen_files, self.pending_files):
+            for path in [path for path in tracked_files if path not in signatures]:
+                del tracked_files[path]
+        ready_files = []
+        for path, signature in sorted(signatures.items()):
+            if self.seen_files.get(path) == signature:
+                continue
+            if self.pending_files.get(path) == signature:
+                del self.pending_files[path]
+                self.seen_files[path] = signature
+                ready_files.append(path)
+            else:
+                # file still being written or first seen, check again on next poll
+                self.pending_files[path] = signature
+        return ready_files
+
+    def process_file(self, snapshot_path: str, export_path: "str | None" = None) -> "dict | None":
+        """Read a snapshot file, compare it to the baseline, print and export the results."""
+        start = time.perf_counter()
+        secondary_df = read_df_from_path(snapshot_path, log=log, input_format="csv")
+        if secondary_df.empty:
+            log.error(f"Snapshot {snapshot_path} is empty. Skipping snapshot!")
+            return None
+        report = self.compare_snapshot(secondary_df)
+        if report is None:
+            return None
+        snapshot_name = os.path.splitext(os.path.basename(snapshot_path))[0]
+        if report["structural_diffs"]:
+            print(f"{snapshot_name} : structural differences against the baseline ❌ ")
+            for structural_diff in report["structural_diffs"]:
+                log.warning(f"{snapshot_name} {structural_diff}")
+                print(structural_diff)
+        difference_count = (
+            report["export_diffs"].shape[0]
+            + report["primary_exclusive"]
+            + report["secondary_exclusive"]
+        )
+        if difference_count == 0 and report["structural_diffs"]:
+            print(f"{snapshot_name} : no content differences on the compared columns.")
+        elif difference_count == 0:
+            print(
+                f"{snapshot_name} : no content differences against the baseline ! - {colored('OK','green')} ✅"
+            )
+        else:
+            print(
+                f"{snapshot_name} : {report['export_diffs'].shape[0]:,} differing records, "
+                f"{report['primary_exclusive']:,} only in the Primary dataset, "
+                f"{report['secondary_exclusive']:,} only in the Secondary dataset. ❌ "
+            )
+            render_difference_summary(report["summary"])
+            if export_path:
+                export_df_to_path(
+                    report["export_diffs"],
+                    log,
+                    export_path=export_path,
+                    file_name=f"{self.test_name}_{snapshot_name}",
+                )
+        log.info(f"Compared {snapshot_path} in {time.perf_counter() - start:.3f}s.")
+        return report
+
+    def poll_and_process(
+        self,
+        watch_dir: str,
+        pattern: str = "*.csv",
+        export_path: "str | None" = None,
+    ) -> "list[dict]":
+        """Compare every snapshot ready in the directory, logging and skipping the ones that fail."""
+        reports = []
+        for snapshot_path in self.poll(watch_dir, pattern):
+            # a bad drop is skipped, it must not stop the watch
+            try:
+                report = self.process_file(snapshot_path, export_path=export_path)
+            except Exception as error:
+                log.error(
+                    f"Unable to compare {snapshot_path} : {type(error).__name__} {error}. Skipping snapshot!"
+                )
+                continue
+            if report is not None:
+                reports.append(report)
+        return reports
+
+    def watch(
+        self,
+        watch_dir: str,
+        pattern: str = "*.csv",
+        interval: float = 1.0,
+        export_path: "str | None" = None,
+    ) -> None:
+        """Poll the directory until interrupted, comparing every new snapshot file."""
+        check_export_path(watch_dir, export_path)
+        # files already present are part of the history, only new drops are compared
+        self.seen_files.update(self.scan(watch_dir, pattern))
+        print(f"Watching {watch_dir} for new {pattern} snapshots, press Ctrl+C to stop.")
+        try:
+            while True:
+                self.poll_and_process(watch_dir, pattern=pattern, export_path=export_path)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("Stopped watching.")
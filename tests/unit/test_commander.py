@@ -0,0 +1,177 @@
+import os
+import pytest
+import subprocess
+import sys
+import time
+
+# seconds --help may take on top of a bare interpreter start, raise it on slow runners
+STARTUP_BUDGET_SECONDS = float(os.environ.get("P_COMPARE_STARTUP_BUDGET", "1.0"))
+
+def timed_run(command: "list[str]") -> "tuple[subprocess.CompletedProcess, float]":
+    start = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True)
+    return result, time.perf_counter() - start
+
+def test_commander_import_is_lazy():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, perpetuum_comparer.commander; "
+            "print([m for m in ('pandas', 'duckdb', 'tabulate') if m in sys.modules])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert(result.stdout.strip() == "[]")
+
+def test_help_startup_time():
+    _, baseline = timed_run([sys.executable, "-c", "pass"])
+    result, elapsed = timed_run([sys.executable, "-m", "perpetuum_comparer.commander", "--help"])
+    assert(result.returncode == 0)
+    assert(elapsed - baseline < STARTUP_BUDGET_SECONDS)
+
+def test_unknown_engine_rejected_before_loading_data():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "perpetuum_comparer.commander",
+            "-pd", "test_files/docA.csv",
+            "-sd", "test_files/docB.csv",
+            "-li", "A",
+            "-ce", "dummy_engine",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert(result.returncode != 0)
+    assert("invalid choice" in result.stderr)
+
+def test_engine_registered_after_import_is_selectable():
+    from perpetuum_comparer import commander
+    from perpetuum_comparer.engines import ENGINES, register_engine
+    register_engine("late_engine", "perpetuum_comparer.comparer:DataComparer")
+    try:
+        args = commander.parser.parse_args(
+            ["-pd", "test_files/docA.csv", "-sd", "test_files/docB.csv", "-li", "A", "-ce", "late_engine"]
+        )
+    finally:
+        del ENGINES["late_engine"]
+    assert(args.comparison_engine == "late_engine")
+
+def test_watch_mode_rejects_one_shot_options(tmp_path):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "perpetuum_comparer.commander",
+            "-pd", "test_files/docA.csv",
+            "-li", "A",
+            "-wd", str(tmp_path),
+            "-sd", "test_files/docB.csv",
+            "-mr", "5",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert(result.returncode != 0)
+    assert("-sd/--secondary_df, -mr/--max_rows" in result.stderr)
+
+def test_watch_mode_rejects_export_inside_watch_dir(tmp_path):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "perpetuum_comparer.commander",
+            "-pd", "test_files/docA.csv",
+            "-li", "A",
+            "-wd", str(tmp_path),
+            "-ep", str(tmp_path),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert(result.returncode != 0)
+    assert("inside the watched directory" in result.stderr)
+
+@pytest.mark.parametrize("option", ["-mr", "-pg"])
+def test_paging_options_must_be_positive(option):
+    from perpetuum_comparer import commander
+    with pytest.raises(SystemExit):
+        commander.parser.parse_args(
+            ["-pd", "test_files/docA.csv", "-sd", "test_files/docB.csv", "-li", "A", "-ce", "sql", option, "0"]
+        )
+
+@pytest.mark.parametrize(
+    "extra_args, message",
+    [
+        (["-ce", "auto", "-at", "missing_thresholds.json"], "invalid -at/--auto_thresholds file"),
+        (["-ce", "sql", "-at", "missing_thresholds.json"], "only allowed with -ce auto"),
+    ],
+)
+def test_auto_thresholds_errors(extra_args, message):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "perpetuum_comparer.commander",
+            "-pd", "test_files/docA.csv",
+            "-sd", "test_files/docB.csv",
+            "-li", "A",
+        ] + extra_args,
+        capture_output=True,
+        text=True,
+    )
+    assert(result.returncode != 0)
+    assert(message in result.stderr)
+    assert("Traceback" not in result.stderr)
+
+def test_threads_must_be_positive():
+    from perpetuum_comparer import commander
+    with pytest.raises(SystemExit):
+        commander.parser.parse_args(
+            ["-pd", "test_files/docA.csv", "-sd", "test_files/docB.csv", "-li", "A", "-ce", "sql", "-th", "0"]
+        )
+
+def test_duckdb_options_ignored_by_pandas_engine_are_reported():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "perpetuum_comparer.commander",
+            "-pd", "test_files/docA.csv",
+            "-sd", "test_files/docB.csv",
+            "-li", "A",
+            "-ce", "pandas",
+            "-th", "2",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert(result.returncode == 0)
+    assert("no effect with the pandas engine" in result.stdout)
+
+@pytest.mark.parametrize(
+    "extra_args, message",
+    [
+        (["-li", "Z", "-sh", "n"], "Line identifier Z missing from the primary dataset"),
+        (["-li", "A", "-sh", "Y"], "not allowed with -wd/--watch_dir: -sh/--show_details"),
+    ],
+)
+def test_watch_mode_argument_errors(tmp_path, extra_args, message):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "perpetuum_comparer.commander",
+            "-pd", "test_files/docA.csv",
+            "-wd", str(tmp_path),
+        ] + extra_args,
+        capture_output=True,
+        text=True,
+    )
+    assert(result.returncode != 0)
+    assert("Traceback" not in result.stderr)
+    assert(message in result.stderr)
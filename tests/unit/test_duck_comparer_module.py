@@ -0,0 +1,84 @@
+import duckdb
+import pytest
+from perpetuum_comparer.duck_comparer import DuckDataComparer
+from perpetuum_comparer.utils import logging_setup, read_df_from_path
+import logging
+
+def test_content_comparison_match():
+    logger = logging_setup(logging.INFO)
+    df_p = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    df_s = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    dc = DuckDataComparer(
+        "unit_tests",
+        df_p,
+        df_s,
+        "A"
+    )
+
+    dc.structural_comparison()
+    diffs = dc.content_comparison()
+
+    assert(len(diffs) == 0)
+
+def test_content_comparison_mismatch():
+    logger = logging_setup(logging.INFO)
+    df_p = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    df_s = read_df_from_path("test_files/docB.csv", log=logger, input_format="csv")
+    dc = DuckDataComparer(
+        "unit_tests",
+        df_p,
+        df_s,
+        "A"
+    )
+
+    dc.structural_comparison()
+    diffs = dc.content_comparison()
+
+    assert(len(diffs) > 0)
+    assert(len(dc.exclusive_primary_indexes) == 1)
+    assert(len(dc.exclusive_secondary_indexes) == 1)
+
+def test_connection_resource_limits(tmp_path):
+    logger = logging_setup(logging.INFO)
+    df_p = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    dc = DuckDataComparer(
+        "unit_tests",
+        df_p,
+        df_p,
+        "A",
+        threads=1,
+        memory_limit="256MB",
+        temp_dir=str(tmp_path),
+    )
+    settings = dict(
+        dc.connection.execute(
+            "SELECT name, value FROM duckdb_settings() WHERE name IN ('threads', 'temp_directory')"
+        ).fetchall()
+    )
+    assert(settings["threads"] == "1")
+    assert(settings["temp_directory"] == str(tmp_path))
+
+def test_content_comparison_string_line_id():
+    logger = logging_setup(logging.INFO)
+    df_p = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    df_s = read_df_from_path("test_files/docB.csv", log=logger, input_format="csv")
+    df_p["A"] = df_p["A"].astype(str)
+    df_s["A"] = df_s["A"].astype(str)
+    with DuckDataComparer("unit_tests", df_p, df_s, "A") as dc:
+        dc.structural_comparison()
+        diffs = dc.content_comparison()
+    assert(len(diffs) > 0)
+    assert(len(dc.exclusive_primary_indexes) == 1)
+    assert(len(dc.exclusive_secondary_indexes) == 1)
+
+def test_close_connection():
+    logger = logging_setup(logging.INFO)
+    df_p = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    dc = DuckDataComparer("unit_tests", df_p, df_p, "A")
+    dc.close()
+    with pytest.raises(duckdb.ConnectionException):
+        dc.connection.execute("SELECT 1")
+
+def test_invalid_memory_limit():
+    with pytest.raises(ValueError):
+        DuckDataComparer.connect(memory_limit="lots")
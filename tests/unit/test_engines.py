@@ -0,0 +1,71 @@
+import json
+import logging
+import pytest
+from perpetuum_comparer.engines import (
+    AUTO_THRESHOLDS,
+    available_engines,
+    get_engine,
+    load_thresholds,
+    profile_input,
+    register_engine,
+    select_engine,
+)
+from perpetuum_comparer.utils import logging_setup
+from perpetuum_comparer.comparer import DataComparer
+
+def test_default_engines_registered():
+    assert("pandas" in available_engines())
+    assert("sql" in available_engines())
+
+def test_get_engine_pandas():
+    assert(get_engine("pandas") is DataComparer)
+
+def test_get_engine_unknown():
+    with pytest.raises(KeyError):
+        get_engine("dummy_engine")
+
+def test_register_engine_invalid_target():
+    with pytest.raises(ValueError):
+        register_engine("dummy_engine", "perpetuum_comparer.comparer")
+
+def test_profile_input_small_file():
+    profile = profile_input("test_files/docA.csv", sample_bytes=65536)
+    assert(profile["columns"] == 4)
+    assert(profile["rows"] == 6)
+
+def test_profile_input_estimates_from_sample(tmp_path):
+    input_path = tmp_path / "large.csv"
+    input_path.write_text("A,B\n" + "".join(f"{i:05d},1\n" for i in range(10000)))
+    profile = profile_input(str(input_path), sample_bytes=1024)
+    assert(profile["columns"] == 2)
+    assert(9000 < profile["rows"] < 11000)
+
+def test_select_engine_small_input_uses_pandas():
+    logger = logging_setup(logging.INFO)
+    assert(select_engine("test_files/docA.csv", "test_files/docB.csv", log=logger) == "pandas")
+
+def test_select_engine_large_input_uses_sql():
+    logger = logging_setup(logging.INFO)
+    thresholds = {**AUTO_THRESHOLDS, "pandas_max_cells": 1, "single_cpu_pandas_max_cells": 1}
+    assert(
+        select_engine("test_files/docA.csv", "test_files/docB.csv", log=logger, thresholds=thresholds)
+        == "sql"
+    )
+
+def test_select_engine_memory_budget_warns(capsys):
+    logger = logging_setup(logging.INFO)
+    thresholds = {**AUTO_THRESHOLDS, "memory_budget_ratio": 0}
+    engine = select_engine("test_files/docA.csv", "test_files/docB.csv", log=logger, thresholds=thresholds)
+    assert(engine == "pandas")
+    assert("exceeds the memory budget" in capsys.readouterr().out)
+
+def test_load_thresholds_unknown_key(tmp_path):
+    thresholds_path = tmp_path / "thresholds.json"
+    thresholds_path.write_text(json.dumps({"dummy_threshold": 1}))
+    with pytest.raises(ValueError):
+        load_thresholds(str(thresholds_path))
+
+def test_load_thresholds_override(tmp_path):
+    thresholds_path = tmp_path / "thresholds.json"
+    thresholds_path.write_text(json.dumps({"pandas_max_cells": 10}))
+    assert(load_thresholds(str(thresholds_path))["pandas_max_cells"] == 10)
@@ -0,0 +1,59 @@
+import io
+import pandas as pd
+import pytest
+from perpetuum_comparer.renderer import (
+    page_bounds,
+    render_table,
+    summarize_differences,
+    render_difference_summary,
+)
+
+def test_page_bounds_first_page():
+    assert(page_bounds(100, 20, 1) == (0, 20))
+
+def test_page_bounds_last_partial_page():
+    assert(page_bounds(45, 20, 3) == (40, 45))
+
+def test_page_bounds_out_of_range():
+    assert(page_bounds(10, 20, 5) == (10, 10))
+
+def test_page_bounds_invalid_page():
+    with pytest.raises(ValueError):
+        page_bounds(10, 20, 0)
+
+def test_render_table_is_bounded():
+    df = pd.DataFrame({"A": range(10000), "B": range(10000)})
+    stream = io.StringIO()
+    render_table(df, page_size=5, page=2, stream=stream)
+    output = stream.getvalue()
+    table_rows = [line for line in output.splitlines() if line.startswith("|")]
+    assert(len(table_rows) == 6)
+    assert(" 9999 " not in output)
+    assert("Showing rows 6-10 of 10,000 (page 2/2,000)." in output)
+
+def test_summarize_differences_counts_all_rows():
+    df_p = pd.DataFrame({"A": range(3000), "B": range(3000), "C": 1})
+    df_s = pd.DataFrame({"A": range(3000), "B": range(1, 3001), "C": 1})
+    assert(summarize_differences(df_p, df_s, "A", ["A", "B", "C"]) == {"B": 3000})
+
+def test_summarize_differences_ignores_exclusive_rows():
+    df_p = pd.DataFrame({"A": [1, 2, 3], "B": [None, 2, 3]})
+    df_s = pd.DataFrame({"A": [1, 2, 4], "B": [None, 5, 3]})
+    assert(summarize_differences(df_p, df_s, "A", ["A", "B"]) == {"B": 1})
+
+def test_render_difference_summary():
+    stream = io.StringIO()
+    render_difference_summary({"C": 12403}, stream=stream)
+    assert("column C: 12,403 mismatches" in stream.getvalue())
+
+def test_render_table_empty():
+    stream = io.StringIO()
+    render_table(pd.DataFrame({"A": []}), page_size=5, page=1, stream=stream)
+    assert(stream.getvalue() == "No differing records.\n")
+
+def test_render_table_page_out_of_range():
+    stream = io.StringIO()
+    render_table(pd.DataFrame({"A": range(3)}), page_size=5, page=2, stream=stream)
+    output = stream.getvalue()
+    assert("Page 2 is out of range, 3 rows available (1 pages)." in output)
+    assert("+" not in output)
@@ -0,0 +1,93 @@
+import logging
+import os
+import shutil
+import pytest
+from perpetuum_comparer.watcher import BaselineWatcher, check_export_path
+from perpetuum_comparer.utils import logging_setup, read_df_from_path
+
+logger = logging_setup(logging.INFO)
+
+def baseline_watcher():
+    df_p = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    return BaselineWatcher("unit_tests", df_p, "A")
+
+def test_compare_snapshot_match():
+    df_s = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    report = baseline_watcher().compare_snapshot(df_s)
+    assert(report["export_diffs"].shape[0] == 0)
+    assert(report["primary_exclusive"] == 0)
+    assert(report["secondary_exclusive"] == 0)
+
+def test_compare_snapshot_mismatch():
+    df_s = read_df_from_path("test_files/docB.csv", log=logger, input_format="csv")
+    report = baseline_watcher().compare_snapshot(df_s)
+    assert(report["summary"] == {"D": 2, "B": 1})
+    assert(report["primary_exclusive"] == 1)
+    assert(report["secondary_exclusive"] == 1)
+    assert("4/6" in report["export_diffs"]["B"].to_list())
+
+def test_baseline_fingerprints_are_reused():
+    watcher = baseline_watcher()
+    df_s = read_df_from_path("test_files/docB.csv", log=logger, input_format="csv")
+    watcher.compare_snapshot(df_s)
+    watcher.compare_snapshot(df_s)
+    assert(len(watcher.fingerprints) == 1)
+
+def test_duplicated_line_id_rejected():
+    df_p = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    with pytest.raises(ValueError):
+        BaselineWatcher("unit_tests", df_p.iloc[[0, 0]], "A")
+
+def test_poll_waits_for_stable_files(tmp_path):
+    watcher = baseline_watcher()
+    shutil.copy("test_files/docB.csv", tmp_path / "snapshot.csv")
+    assert(watcher.poll(str(tmp_path)) == [])
+    assert(watcher.poll(str(tmp_path)) == [os.path.join(str(tmp_path), "snapshot.csv")])
+    assert(watcher.poll(str(tmp_path)) == [])
+
+def test_compare_snapshot_dtype_drift():
+    df_s = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    df_s["B"] = df_s["B"].astype(float)
+    df_s.loc[0, "B"] = None
+    df_s.loc[1, "B"] = 999
+    report = baseline_watcher().compare_snapshot(df_s)
+    assert(report["summary"] == {"B": 2})
+    assert(report["export_diffs"]["B"].to_list() == ["2/nan", "4/999.0"])
+    assert(len(report["structural_diffs"]) == 1)
+    assert("compared as float64" in report["structural_diffs"][0])
+
+def test_compare_snapshot_missing_column_reported():
+    df_s = read_df_from_path("test_files/docA.csv", log=logger, input_format="csv")
+    report = baseline_watcher().compare_snapshot(df_s.drop(columns=["D"]))
+    assert(report["summary"] == {})
+    assert(report["structural_diffs"] == ["column D: only in the Primary dataset, not compared"])
+
+def test_poll_and_process_skips_bad_files(tmp_path):
+    watcher = baseline_watcher()
+    (tmp_path / "empty.csv").write_text("")
+    (tmp_path / "malformed.csv").write_text('A,B\n1,"2\n')
+    shutil.copy("test_files/docB.csv", tmp_path / "snapshot.csv")
+    watcher.poll(str(tmp_path))
+    reports = watcher.poll_and_process(str(tmp_path))
+    assert(len(reports) == 1)
+    assert(reports[0]["summary"] == {"D": 2, "B": 1})
+
+def test_check_export_path_inside_watch_dir(tmp_path):
+    with pytest.raises(ValueError):
+        check_export_path(str(tmp_path), str(tmp_path / "."))
+
+def test_check_export_path_missing(tmp_path):
+    with pytest.raises(ValueError):
+        check_export_path(str(tmp_path / "watch"), str(tmp_path / "missing"))
+
+def test_poll_skips_and_forgets_vanished_files(tmp_path, monkeypatch):
+    watcher = baseline_watcher()
+    shutil.copy("test_files/docB.csv", tmp_path / "snapshot.csv")
+    shutil.copy("test_files/docB.csv", tmp_path / "vanished.csv")
+    watcher.poll(str(tmp_path))
+    entries = list(os.scandir(tmp_path))
+    os.remove(tmp_path / "vanished.csv")
+    monkeypatch.setattr(os, "scandir", lambda path: iter(entries))
+    assert(watcher.poll(str(tmp_path)) == [os.path.join(str(tmp_path), "snapshot.csv")])
+    assert(os.path.join(str(tmp_path), "vanished.csv") not in watcher.pending_files)
+    assert(os.path.join(str(tmp_path), "vanished.csv") not in watcher.seen_files)